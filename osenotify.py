@@ -5,25 +5,38 @@
 适配云服务器环境
 """
 import os
-import json
 import time
+import random
+import asyncio
+import signal
+import queue
 import logging
-import threading
+import functools
+import contextlib
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Callable, Set
-from logging.handlers import RotatingFileHandler
+from typing import Optional, Dict, Any, List, Callable, Set, Tuple, Awaitable, NamedTuple
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from enum import Enum, auto
 from pathlib import Path
-from flask import Flask, jsonify
-import threading
-import glob  # 添加到导入部分
+from collections import OrderedDict
+from types import MappingProxyType
 
 # 第三方库
-import requests
-import websocket
+import aiohttp
+import msgspec
+import uvicorn
+import websockets
+from websockets.asyncio.client import connect as ws_client_connect  # 新版asyncio客户端（支持recv(decode=False)）
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+try:
+    import uvloop  # 可选：基于libuv的高性能事件循环（不支持Windows）
+except ImportError:
+    uvloop = None
+
 # =========================
 # 枚举和常量定义
 # =========================
@@ -39,8 +52,8 @@ class ProgramState(Enum):
     PAUSED = auto()
     STOPPING = auto()
 
-# JMA震度映射表（从小到大）
-JMA_INTENSITY_MAP = {
+# JMA震度映射表（从小到大，只读）
+JMA_INTENSITY_MAP = MappingProxyType({
     "0": 0,
     "1": 1,
     "2": 2,
@@ -51,7 +64,69 @@ JMA_INTENSITY_MAP = {
     "6弱": 7,
     "6強": 8,
     "7": 9
-}
+})
+
+# 预警内容模板（字段由对应来源的报文提取函数提供）
+JMA_ALERT_TEMPLATE = (
+    "地点: {place}",
+    "最大震度: {max_intensity}",
+    "震级: M{mag}   深度: {depth} km",
+    "来源: 日本气象厅 (JMA)",
+    "发布时间: {ann}",
+    "事件ID: {eid}",
+)
+
+CEA_ALERT_TEMPLATE = (
+    "地点: {place}",
+    "预估烈度: {epi_val:.1f}",
+    "震级: M{mag}   深度: {depth} km",
+    "来源: 中国地震预警网 (CEA)",
+    "发震时刻: {shock}",
+    "事件ID: {eid}",
+)
+
+# 去重记录保留的最大事件ID数量
+MAX_TRIGGERED_EVENTS = 4096
+
+# WebSocket重连退避参数（截断指数退避，与websockets库的算法一致）
+BACKOFF_MIN = 1.92
+BACKOFF_FACTOR = 1.618
+BACKOFF_MAX = 60.0
+
+# 退出时等待进行中的Gotify推送完成的最长时间(秒)，覆盖3次请求(各8秒)及其间的重试等待
+SHUTDOWN_PUSH_TIMEOUT = 40
+
+# =========================
+# 报文结构定义（使用msgspec直接解码为类型化对象）
+# =========================
+class JmaMessage(msgspec.Struct):
+    """JMA紧急地震速报报文"""
+    # 标志位按真值判断，兼容null或0/1等非布尔取值
+    isCancel: Any = False
+    isTraining: Any = False
+    isAssumption: Any = False
+    MaxIntensity: Any = ""
+    Hypocenter: Any = ""
+    Magunitude: Any = ""  # 注意：数据源字段就是这个拼写
+    Depth: Any = ""
+    AnnouncedTime: Any = ""
+    EventID: Any = ""
+
+class CeaData(msgspec.Struct):
+    """CEA预警报文中的地震数据"""
+    placeName: Any = ""
+    magnitude: Any = ""
+    depth: Any = ""
+    shockTime: Any = ""
+    eventId: Any = ""
+    epiIntensity: Any = 0
+
+# 全部字段均为默认值的CEA数据（对应原始报文中的空"Data"对象）
+EMPTY_CEA_DATA = CeaData()
+
+class CeaMessage(msgspec.Struct):
+    """CEA预警报文"""
+    Data: Optional[CeaData] = None
 
 # =========================
 # 配置类（使用dataclass管理配置）
@@ -78,7 +153,7 @@ class AppConfig:
     log_retention_days: int = 30  # 日志保留天数
     
     # 其他配置
-    ws_reconnect_delay: int = 5  # WebSocket重连延迟(秒)
+    ws_reconnect_delay: int = 5  # WebSocket首次重连的随机抖动上限(秒)
     log_cleanup_interval: int = 86400  # 日志清理间隔(秒)，默认每天一次
     
     def to_dict(self) -> Dict[str, Any]:
@@ -107,9 +182,12 @@ class GlobalState:
         self.monitoring_enabled = True
         self.program_state = ProgramState.RUNNING
         self.last_trigger_time = 0.0
-        self.triggered_event_ids: Set[str] = set()
+        self.triggered_event_ids: "OrderedDict[str, None]" = OrderedDict()  # 有界LRU去重记录
         self.logger: Optional[logging.Logger] = None
-        self.lock = threading.Lock()  # 添加线程锁
+        self.log_listener: Optional[QueueListener] = None  # 后台日志写入线程
+        self.http_session: Optional[aiohttp.ClientSession] = None  # 共享HTTP会话
+        self.background_tasks: Set[asyncio.Task] = set()  # 持有后台任务引用，防止被垃圾回收
+        self.stop_event: Optional[asyncio.Event] = None  # 退出信号，在事件循环中创建
         
         # WebSocket连接状态
         self.jma_last_message_time = 0.0
@@ -126,47 +204,60 @@ class GlobalState:
         self.last_trigger_time = time.time()
     
     def add_triggered_event(self, event_id: str):
-        """添加已触发的事件ID"""
-        self.triggered_event_ids.add(event_id)
+        """添加已触发的事件ID（超出上限时淘汰最旧的记录）"""
+        self.triggered_event_ids[event_id] = None
+        self.triggered_event_ids.move_to_end(event_id)
+        while len(self.triggered_event_ids) > MAX_TRIGGERED_EVENTS:
+            self.triggered_event_ids.popitem(last=False)
     
     def is_event_triggered(self, event_id: str) -> bool:
         """检查事件是否已触发过"""
-        return event_id in self.triggered_event_ids
+        if event_id in self.triggered_event_ids:
+            self.triggered_event_ids.move_to_end(event_id)
+            return True
+        return False
     
     def update_jma_status(self, connected: bool = None):
         """更新JMA连接状态"""
-        with self.lock:
-            if connected is not None:
-                self.jma_connected = connected
-            if connected:
-                self.jma_last_message_time = time.time()
+        if connected is not None:
+            self.jma_connected = connected
+        if connected:
+            self.jma_last_message_time = time.time()
     
     def update_cea_status(self, connected: bool = None):
         """更新CEA连接状态"""
-        with self.lock:
-            if connected is not None:
-                self.cea_connected = connected
-            if connected:
-                self.cea_last_message_time = time.time()
+        if connected is not None:
+            self.cea_connected = connected
+        if connected:
+            self.cea_last_message_time = time.time()
     
     def get_status(self) -> Dict[str, Any]:
         """获取程序状态信息"""
-        with self.lock:
-            return {
-                "program_state": self.program_state.name,
-                "monitoring_enabled": self.monitoring_enabled,
-                "in_cooldown": self.is_in_cooldown(),
-                "cooldown_remaining": max(0, self.config.cooldown - (time.time() - self.last_trigger_time)),
-                "jma_connected": self.jma_connected,
-                "cea_connected": self.cea_connected,
-                "jma_last_message": time.time() - self.jma_last_message_time if self.jma_last_message_time > 0 else None,
-                "cea_last_message": time.time() - self.cea_last_message_time if self.cea_last_message_time > 0 else None,
-                "triggered_events_count": len(self.triggered_event_ids)
-            }
-    
-    def cleanup(self):
+        return {
+            "program_state": self.program_state.name,
+            "monitoring_enabled": self.monitoring_enabled,
+            "in_cooldown": self.is_in_cooldown(),
+            "cooldown_remaining": max(0, self.config.cooldown - (time.time() - self.last_trigger_time)),
+            "jma_connected": self.jma_connected,
+            "cea_connected": self.cea_connected,
+            "jma_last_message": time.time() - self.jma_last_message_time if self.jma_last_message_time > 0 else None,
+            "cea_last_message": time.time() - self.cea_last_message_time if self.cea_last_message_time > 0 else None,
+            "triggered_events_count": len(self.triggered_event_ids)
+        }
+    
+    async def cleanup(self):
         """清理资源"""
-        pass  # 云服务器版无需特定清理
+        # 关闭共享的HTTP会话
+        if self.http_session is not None:
+            await self.http_session.close()
+            self.http_session = None
+        
+        # 停止日志监听线程（会先写出队列中剩余的日志）
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            for handler in self.log_listener.handlers:
+                handler.close()
+            self.log_listener = None
 
 # 全局状态实例
 state = GlobalState()
@@ -204,9 +295,12 @@ def setup_logging() -> logging.Logger:
         '%(asctime)s - %(levelname)s - %(message)s'
     ))
     
-    # 添加处理器
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # 通过队列将日志交给后台线程写出，避免文件I/O阻塞事件循环
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    
+    state.log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    state.log_listener.start()
     
     return logger
 
@@ -217,9 +311,15 @@ def validate_config(config: AppConfig) -> bool:
     # 检查配置值有效性
     if config.trigger_jma_intensity not in JMA_INTENSITY_MAP:
         errors.append(f"JMA阈值设置无效: {config.trigger_jma_intensity}")
+    else:
+        # 预先计算阈值数值和显示文本，避免每条消息重复查表
+        set_threshold(AlertSource.JMA, JMA_INTENSITY_MAP[config.trigger_jma_intensity],
+                      config.trigger_jma_intensity)
     
     if config.trigger_cea_intensity <= 0:
         errors.append(f"CEA阈值必须大于0: {config.trigger_cea_intensity}")
+    else:
+        set_threshold(AlertSource.CEA, config.trigger_cea_intensity, str(config.trigger_cea_intensity))
     
     # 检查Gotify配置（可选，但建议验证URL格式）
     if not config.gotify_url or not config.gotify_app_token:
@@ -248,41 +348,49 @@ def cleanup_old_logs():
         # 计算截止日期
         cutoff_time = time.time() - (state.config.log_retention_days * 86400)  # 86400秒=1天
         
-        # 获取所有日志文件
-        log_pattern = os.path.join(state.config.log_dir, "quake_monitor.log*")
-        log_files = glob.glob(log_pattern)
-        
-        # 删除过期的日志文件
-        for log_file in log_files:
-            # 检查文件修改时间
-            if os.path.isfile(log_file) and os.path.getmtime(log_file) < cutoff_time:
-                os.remove(log_file)
-                state.logger.info(f"已删除旧日志文件: {os.path.basename(log_file)}")
+        # 单次遍历日志目录，复用目录项缓存的文件信息
+        with os.scandir(state.config.log_dir) as entries:
+            for entry in entries:
+                # 删除过期的日志文件
+                if (entry.name.startswith("quake_monitor.log")
+                        and entry.is_file()
+                        and entry.stat().st_mtime < cutoff_time):
+                    os.remove(entry.path)
+                    state.logger.info(f"已删除旧日志文件: {entry.name}")
                 
     except Exception as e:
         state.logger.error(f"清理日志文件时出错: {e}")
 
-def log_cleanup_loop():
-    """日志清理循环"""
-    while state.program_state != ProgramState.STOPPING:
+async def wait_for_stop(timeout: float) -> bool:
+    """等待退出信号，最多等待timeout秒；收到退出信号时返回True"""
+    try:
+        await asyncio.wait_for(state.stop_event.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+async def log_cleanup_loop():
+    """日志清理循环（空闲期间不占用CPU，收到退出信号立即结束）"""
+    while True:
         try:
             # 等待清理间隔时间
-            time.sleep(state.config.log_cleanup_interval)
+            if await wait_for_stop(state.config.log_cleanup_interval):
+                return
             
-            # 执行日志清理
-            if state.program_state != ProgramState.STOPPING:
-                cleanup_old_logs()
+            # 在线程池中执行日志清理，避免文件系统操作阻塞事件循环
+            await asyncio.to_thread(cleanup_old_logs)
                 
         except Exception as e:
             state.logger.error(f"日志清理循环出错: {e}")
             # 出错后等待一段时间再继续
-            time.sleep(3600)  # 1小时
+            if await wait_for_stop(3600):  # 1小时
+                return
 
 # =========================
 # 核心功能函数
 # =========================
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-def push_gotify(title: str, message: str, priority: int = 10):
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10), reraise=True)
+async def push_gotify(title: str, message: str, priority: int = 10):
     """通过 Gotify 推送通知（带重试机制）"""
     try:
         url = f"{state.config.gotify_url}/message?token={state.config.gotify_app_token}"
@@ -292,15 +400,15 @@ def push_gotify(title: str, message: str, priority: int = 10):
             "priority": priority
         }
 
-        response = requests.post(url, json=payload, timeout=8)
-        response.raise_for_status()
+        async with state.http_session.post(url, json=payload) as response:
+            response.raise_for_status()
         state.logger.info("已通过 Gotify 推送手机通知")
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         state.logger.error(f"Gotify 推送失败: {e}")
         raise
 
-def unified_trigger(source: AlertSource, lines: List[str], event_id: Optional[str] = None):
+async def unified_trigger(source: AlertSource, lines: List[str], event_id: Optional[str] = None):
     """
     统一触发处理函数，处理地震预警事件
     
@@ -309,27 +417,26 @@ def unified_trigger(source: AlertSource, lines: List[str], event_id: Optional[st
         lines: 预警信息内容列表
         event_id: 事件ID，用于去重（可选）
     """
-    # 使用线程锁确保状态检查的原子性
-    with state.lock:
-        # 检查是否启用监控
-        if not state.monitoring_enabled:
-            state.logger.info("监控已暂停，忽略触发")
-            return
-            
-        # 去重检查
-        if event_id and state.is_event_triggered(event_id):
-            state.logger.info(f"事件 {event_id} 已触发过，忽略")
-            return
-            
-        # 冷却检查
-        if state.is_in_cooldown():
-            state.logger.info("冷却时间内，忽略触发")
-            return
-            
-        # 更新触发时间和事件ID
-        state.update_trigger_time()
-        if event_id:
-            state.add_triggered_event(event_id)
+    # 以下检查与更新之间没有await，在事件循环中天然是原子的
+    # 检查是否启用监控
+    if not state.monitoring_enabled:
+        state.logger.info("监控已暂停，忽略触发")
+        return
+        
+    # 去重检查
+    if event_id and state.is_event_triggered(event_id):
+        state.logger.info(f"事件 {event_id} 已触发过，忽略")
+        return
+        
+    # 冷却检查
+    if state.is_in_cooldown():
+        state.logger.info("冷却时间内，忽略触发")
+        return
+        
+    # 更新触发时间和事件ID
+    state.update_trigger_time()
+    if event_id:
+        state.add_triggered_event(event_id)
 
     # 生成内容并记录
     source_name = {
@@ -340,116 +447,125 @@ def unified_trigger(source: AlertSource, lines: List[str], event_id: Optional[st
     
     content = "\n".join(lines)
     
-    # 将耗时操作放在单独线程中执行，避免阻塞WebSocket消息处理
-    def trigger_operations():
+    # 将耗时操作放在单独任务中执行，避免阻塞WebSocket消息处理
+    async def trigger_operations():
         state.logger.info(f"触发来源: {source_name}\n{content}")
         
         # 推送 Gotify（强提醒）
-        push_gotify("⚠️ 强震预警", f"{content}", priority=10)
+        try:
+            await push_gotify("⚠️ 强震预警", f"{content}", priority=10)
+        except Exception as e:
+            state.logger.error(f"Gotify 推送最终失败: {e}")
     
-    # 启动线程执行触发操作
-    threading.Thread(target=trigger_operations, daemon=True).start()
+    # 在事件循环中调度触发操作
+    task = asyncio.create_task(trigger_operations())
+    state.background_tasks.add(task)
+    task.add_done_callback(state.background_tasks.discard)
 
 # =========================
 # WebSocket 处理函数
 # =========================
-def on_message_jma(ws, message):
-    """处理JMA WebSocket消息"""
-    # 更新最后消息时间
-    state.update_jma_status(True)
+# 提取结果: (烈度数值, 预警模板字段, 事件ID, 未达阈值时的日志摘要)
+Extraction = Tuple[float, Dict[str, Any], str, str]
+
+def extract_jma(msg: JmaMessage) -> Optional[Extraction]:
+    """从JMA报文中提取预警信息，非正式报文返回None"""
+    # 忽略取消、训练和假设报文
+    if msg.isCancel or msg.isTraining or msg.isAssumption:
+        state.logger.info("JMA 非正式/取消报文，忽略")
+        return None
+        
+    # 获取最大震度，使用映射表转换为数值（未知震度为-1，永远不会达到阈值）
+    max_intensity = str(msg.MaxIntensity).strip()
+    intensity_value = JMA_INTENSITY_MAP.get(max_intensity, -1)
+    eid = str(msg.EventID)
+    
+    fields = {
+        "place": msg.Hypocenter,
+        "max_intensity": max_intensity,
+        "mag": msg.Magunitude,
+        "depth": msg.Depth,
+        "ann": msg.AnnouncedTime,
+        "eid": eid,
+    }
     
-    if not state.monitoring_enabled:
-        return
+    return intensity_value, fields, eid, f"最大震度 {max_intensity}"
+
+def extract_cea(msg: CeaMessage) -> Optional[Extraction]:
+    """从CEA报文中提取预警信息，无数据时返回None"""
+    d = msg.Data
+    
+    if d is None or d == EMPTY_CEA_DATA:
+        return None
         
     try:
-        data = json.loads(message)
-        
-        # 忽略取消、训练和假设报文
-        if data.get("isCancel", False) or data.get("isTraining", False) or data.get("isAssumption", False):
-            state.logger.info("JMA 非正式/取消报文，忽略")
-            return
-            
-        # 获取最大震度
-        max_intensity = str(data.get("MaxIntensity", "")).strip()
-        
-        # 使用映射表进行比较
-        current_intensity_value = JMA_INTENSITY_MAP.get(max_intensity, -1)
-        threshold_value = JMA_INTENSITY_MAP.get(state.config.trigger_jma_intensity, -1)
-        
-        # 检查是否达到阈值
-        if current_intensity_value >= threshold_value and current_intensity_value != -1:
-            place = data.get("Hypocenter", "")
-            mag = data.get("Magunitude", "")  # 注意：数据源字段就是这个拼写
-            depth = data.get("Depth", "")
-            ann = data.get("AnnouncedTime", "")
-            eid = str(data.get("EventID", ""))
-            
-            # 调整消息格式和顺序
-            lines = [
-                f"地点: {place}",
-                f"最大震度: {max_intensity}",
-                f"震级: M{mag}   深度: {depth} km",
-                f"来源: 日本气象厅 (JMA)",
-                f"发布时间: {ann}",
-                f"事件ID: {eid}"
-            ]
-            
-            unified_trigger(AlertSource.JMA, lines, eid)
-        else:
-            state.logger.info(f"JMA 更新：最大震度 {max_intensity} (阈值: {state.config.trigger_jma_intensity})")
-            
-    except json.JSONDecodeError as e:
-        state.logger.error(f"JMA JSON解析错误: {e}")
-    except Exception as e:
-        state.logger.error(f"JMA 解析错误: {e}")
+        epi_val = float(d.epiIntensity)
+    except (ValueError, TypeError):
+        epi_val = 0.0
+    eid = str(d.eventId)
+    
+    fields = {
+        "place": d.placeName,
+        "epi_val": epi_val,
+        "mag": d.magnitude,
+        "depth": d.depth,
+        "shock": d.shockTime,
+        "eid": eid,
+    }
+    
+    return epi_val, fields, eid, f"烈度 {epi_val:.1f}"
+
+class MessageHandler(NamedTuple):
+    """单个预警来源的消息处理配置"""
+    decoder: msgspec.json.Decoder  # 报文解码器
+    extract: Callable[[Any], Optional[Extraction]]  # 报文提取函数
+    update_status: Callable[[Optional[bool]], None]  # 连接状态更新函数
+    template: Tuple[str, ...]  # 预警内容模板
+    threshold: float = float("inf")  # 触发阈值数值，配置验证通过前不会触发
+    threshold_text: str = ""  # 阈值显示文本（用于日志）
+
+# 各预警来源的处理表
+MESSAGE_HANDLERS: Dict[AlertSource, MessageHandler] = {
+    AlertSource.JMA: MessageHandler(msgspec.json.Decoder(JmaMessage), extract_jma,
+                                    state.update_jma_status, JMA_ALERT_TEMPLATE),
+    AlertSource.CEA: MessageHandler(msgspec.json.Decoder(CeaMessage), extract_cea,
+                                    state.update_cea_status, CEA_ALERT_TEMPLATE),
+}
 
-def on_message_cea(ws, message):
-    """处理CEA WebSocket消息"""
+def set_threshold(source: AlertSource, value: float, text: str):
+    """设置预警来源的触发阈值（在配置验证时调用一次）"""
+    MESSAGE_HANDLERS[source] = MESSAGE_HANDLERS[source]._replace(threshold=value, threshold_text=text)
+
+async def handle_message(source: AlertSource, message: bytes):
+    """处理JMA/CEA WebSocket消息"""
+    handler = MESSAGE_HANDLERS[source]
+    
     # 更新最后消息时间
-    state.update_cea_status(True)
+    handler.update_status(True)
     
     if not state.monitoring_enabled:
         return
         
     try:
-        data = json.loads(message)
-        d = data.get("Data", {})
-        
-        if not d:
+        result = handler.extract(handler.decoder.decode(message))
+        if result is None:
             return
             
-        place = d.get("placeName", "")
-        mag = d.get("magnitude", "")
-        depth = d.get("depth", "")
-        shock = d.get("shockTime", "")
-        eid = str(d.get("eventId", ""))
-        epi = d.get("epiIntensity", 0)
+        intensity_value, fields, eid, summary = result
         
-        try:
-            epi_val = float(epi)
-        except (ValueError, TypeError):
-            epi_val = 0.0
-            
-        # 检查是否达到阈值
-        if epi_val >= state.config.trigger_cea_intensity:
-            # 调整消息格式和顺序
-            lines = [
-                f"地点: {place}",
-                f"预估烈度: {epi_val:.1f}",
-                f"震级: M{mag}   深度: {depth} km",
-                f"来源: 中国地震预警网 (CEA)",
-                f"发震时刻: {shock}",
-                f"事件ID: {eid}"
-            ]
-            
-            unified_trigger(AlertSource.CEA, lines, eid)
+        # 检查是否达到阈值，仅在触发时才生成预警内容
+        if intensity_value >= handler.threshold:
+            lines = [line.format_map(fields) for line in handler.template]
+            await unified_trigger(source, lines, eid)
         else:
-            state.logger.info(f"CEA 更新：烈度 {epi_val:.1f} (< {state.config.trigger_cea_intensity})")
+            state.logger.info(f"{source.name} 更新：{summary} (阈值: {handler.threshold_text})")
             
-    except json.JSONDecodeError as e:
-        state.logger.error(f"CEA JSON解析错误: {e}")
+    except msgspec.ValidationError as e:
+        state.logger.error(f"{source.name} 报文格式错误: {e}")
+    except msgspec.DecodeError as e:
+        state.logger.error(f"{source.name} JSON解析错误: {e}")
     except Exception as e:
-        state.logger.error(f"CEA 解析错误: {e}")
+        state.logger.error(f"{source.name} 解析错误: {e}")
 
 def on_error_jma(ws, error):
     """处理JMA WebSocket错误"""
@@ -481,33 +597,69 @@ def on_open_cea(ws):
     state.logger.info("CEA WebSocket连接已建立")
     state.update_cea_status(True)
 
-def ws_loop(name: str, url: str, handler: Callable, 
-           on_open: Callable, on_error: Callable, on_close: Callable):
-    """WebSocket连接循环（带自动重连）"""
-    while state.program_state != ProgramState.STOPPING:
+async def ws_connect(url: str, handler: Callable, 
+                     on_open: Callable, on_error: Callable, on_close: Callable) -> bool:
+    """建立一次WebSocket连接并持续接收消息，返回连接是否曾成功建立"""
+    ws = None
+    try:
+        async with ws_client_connect(url, ping_interval=25, ping_timeout=10) as ws:
+            on_open(ws)
+            while True:
+                # 以bytes形式接收，跳过UTF-8解码校验，由msgspec直接解析
+                message = await ws.recv(decode=False)
+                await handler(message)
+    except websockets.ConnectionClosed:
+        on_close(ws, ws.close_code, ws.close_reason)
+    except Exception as e:
+        on_error(ws, e)
+    return ws is not None
+
+async def supervised(name: str, coro_factory: Callable[[], Awaitable[bool]]):
+    """
+    监督运行任务，任务结束或异常后按截断指数退避（带随机抖动）自动重启，
+    收到退出信号时取消正在运行的任务
+    
+    Args:
+        name: 任务名称（用于日志）
+        coro_factory: 创建任务协程的函数，协程返回True表示本次运行成功建立过连接（重置退避时间）
+    """
+    backoff_delay = BACKOFF_MIN
+    while not state.stop_event.is_set():
+        task = asyncio.create_task(coro_factory())
+        stop_task = asyncio.create_task(state.stop_event.wait())
         try:
-            ws = websocket.WebSocketApp(
-                url,
-                on_message=handler,
-                on_error=on_error,
-                on_close=on_close,
-                on_open=on_open
-            )
-            ws.run_forever(ping_interval=25, ping_timeout=10)
-        except Exception as e:
-            state.logger.error(f"{name} run_forever 异常: {e}")
+            done, _ = await asyncio.wait({task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop_task.cancel()
+            if not task.done():
+                task.cancel()
+        
+        # 收到退出信号，等待任务取消完成后结束
+        if task not in done:
+            await asyncio.gather(task, return_exceptions=True)
+            return
             
-        # 检查是否需要停止
-        if state.program_state == ProgramState.STOPPING:
-            break
+        try:
+            if task.result():
+                # 成功建立过连接，重置退避时间
+                backoff_delay = BACKOFF_MIN
+        except Exception as e:
+            state.logger.error(f"{name} 任务异常: {e}")
             
-        # 断线重连间隔
-        time.sleep(state.config.ws_reconnect_delay)
+        # 重启间隔：首次重启随机抖动，之后按指数增长，避免集中重连
+        if backoff_delay == BACKOFF_MIN:
+            delay = random.random() * state.config.ws_reconnect_delay
+        else:
+            delay = int(backoff_delay)
+        state.logger.info(f"{name} 将在 {delay:.1f} 秒后重连")
+        if await wait_for_stop(delay):
+            return
+        backoff_delay = min(backoff_delay * BACKOFF_FACTOR, BACKOFF_MAX)
 
 # =========================
 # 主程序
 # =========================
-def main():
+async def main():
     """主程序入口"""
     # 初始化日志
     state.logger = setup_logging()
@@ -515,16 +667,33 @@ def main():
     # 验证配置
     if not validate_config(state.config):
         state.logger.error("配置验证失败，程序退出")
+        await state.cleanup()
         return
     
     # 确保日志目录存在
     if not ensure_directory_exists(state.config.log_dir):
         state.logger.error("无法创建日志目录，程序退出")
+        await state.cleanup()
         return
     
-    # 启动日志清理线程
-    log_cleanup_thread = threading.Thread(target=log_cleanup_loop, daemon=True)
-    log_cleanup_thread.start()
+    # 注册退出信号（Windows不支持，回退到KeyboardInterrupt）
+    state.stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, state.stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    
+    # 创建共享HTTP会话（保持到Gotify的长连接，重试时复用同一连接）
+    connector = aiohttp.TCPConnector(limit=4, ttl_dns_cache=300, keepalive_timeout=60)
+    state.http_session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=8)
+    )
+    
+    # 健康检查服务器（与主程序共享事件循环）
+    health_server = HealthServer(uvicorn.Config(app, host='0.0.0.0', port=5000, log_level='warning'))
     
     state.logger.info(
         f"程序已启动 "
@@ -533,41 +702,75 @@ def main():
         f"日志保留天数: {state.config.log_retention_days})"
     )
 
-    # 启动两个 WS 线程
-    jma_thread = threading.Thread(
-        target=ws_loop, 
-        args=("JMA", state.config.ws_jma, on_message_jma, on_open_jma, on_error_jma, on_close_jma), 
-        daemon=True
+    # 统一启动所有服务：两个受监督的WS连接、日志清理和健康检查服务器
+    services = asyncio.gather(
+        supervised("JMA", functools.partial(
+            ws_connect, state.config.ws_jma, functools.partial(handle_message, AlertSource.JMA),
+            on_open_jma, on_error_jma, on_close_jma
+        )),
+        supervised("CEA", functools.partial(
+            ws_connect, state.config.ws_cea, functools.partial(handle_message, AlertSource.CEA),
+            on_open_cea, on_error_cea, on_close_cea
+        )),
+        log_cleanup_loop(),
+        serve_health(health_server),
+        return_exceptions=True
     )
-    
-    cea_thread = threading.Thread(
-        target=ws_loop, 
-        args=("CEA", state.config.ws_cea, on_message_cea, on_open_cea, on_error_cea, on_close_cea), 
-        daemon=True
-    )
-    
-    jma_thread.start()
-    cea_thread.start()
 
-    # 主线程循环
+    # 等待退出信号
     try:
-        while state.program_state != ProgramState.STOPPING:
-            time.sleep(1)
+        await state.stop_event.wait()
+        state.logger.info("收到退出信号，程序退出")
             
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         state.logger.info("收到中断信号，程序退出")
         
     finally:
         state.program_state = ProgramState.STOPPING
-        state.cleanup()
+        # 通知所有服务退出：受监督任务和日志清理监听退出信号，健康检查服务器自行优雅退出
+        state.stop_event.set()
+        health_server.should_exit = True
+        for result in await services:
+            if isinstance(result, Exception):
+                state.logger.error(f"服务异常退出: {result}")
+        
+        # 等待进行中的预警推送完成，超时仍未完成的取消并记录
+        if state.background_tasks:
+            state.logger.info(f"等待 {len(state.background_tasks)} 个推送任务完成")
+            _, pending = await asyncio.wait(state.background_tasks, timeout=SHUTDOWN_PUSH_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                state.logger.error(f"退出时仍有 {len(pending)} 个推送任务未完成，已取消")
+        await state.cleanup()
 
 # =========================
-# Flask健康检查服务器
+# FastAPI健康检查服务器
 # =========================
-app = Flask(__name__)
+app = FastAPI()
+
+class HealthServer(uvicorn.Server):
+    """不接管进程信号的uvicorn服务器，退出由主程序统一处理"""
+    def install_signal_handlers(self):
+        """旧版uvicorn的信号注册入口"""
+        pass
+    
+    @contextlib.contextmanager
+    def capture_signals(self):
+        """新版uvicorn的信号捕获入口"""
+        yield
+
+async def serve_health(server: HealthServer):
+    """运行健康检查服务器；启动失败（如端口被占用）只记录错误，不影响地震预警"""
+    try:
+        await server.serve()
+    except (SystemExit, OSError) as e:
+        # uvicorn绑定端口失败时会调用sys.exit(1)
+        state.logger.error(f"健康检查服务器启动失败，预警功能继续运行: {e!r}")
 
-@app.route('/health')
-def health_check():
+@app.get('/health')
+async def health_check():
     """健康检查端点"""
     status = state.get_status()
     
@@ -584,10 +787,10 @@ def health_check():
         "details": status
     }
     
-    return jsonify(response), 200 if overall_health else 503
+    return JSONResponse(response, status_code=200 if overall_health else 503)
 
-@app.route('/status')
-def status_check():
+@app.get('/status')
+async def status_check():
     """状态检查端点，返回更详细的信息"""
     status = state.get_status()
     response = {
@@ -601,28 +804,26 @@ def status_check():
         "cea_last_message_seconds_ago": status["cea_last_message"],
         "triggered_events_count": status["triggered_events_count"]
     }
-    return jsonify(response), 200
+    return JSONResponse(response, status_code=200)
 
-@app.route('/test-gotify')
-def test_gotify():
+@app.get('/test-gotify')
+async def test_gotify():
     """测试Gotify推送功能"""
     try:
         test_title = "连通性测试"
         test_message = f"地震监控服务正常运行 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        push_gotify(test_title, test_message, priority=1)
-        return jsonify({"status": "success", "message": "Gotify测试推送已发送"}), 200
+        await push_gotify(test_title, test_message, priority=1)
+        return JSONResponse({"status": "success", "message": "Gotify测试推送已发送"}, status_code=200)
     except Exception as e:
-        return jsonify({"status": "error", "message": f"Gotify测试失败: {str(e)}"}), 500
-
-def run_health_server():
-    """运行健康检查服务器"""
-    app.run(host='0.0.0.0', port=5000)
+        return JSONResponse({"status": "error", "message": f"Gotify测试失败: {str(e)}"}, status_code=500)
 
 # 程序入口
 if __name__ == "__main__":
-    # 启动健康检查服务器线程
-    health_thread = threading.Thread(target=run_health_server, daemon=True)
-    health_thread.start()
-    
-    # 启动主程序
-    main()
+    try:
+        # 优先使用uvloop事件循环
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
+    except KeyboardInterrupt:
+        pass